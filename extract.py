@@ -1,12 +1,71 @@
 import re
+import os
+import hashlib
+import importlib.metadata
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
 import json
 import argparse
 import logging
 
+logger = logging.getLogger(__name__)
+
+try:
+    # PDFium does the text extraction in native code and is ~5x faster than
+    # pdfplumber's pure-Python pdfminer stack. It ships as a pdfplumber
+    # dependency, but fall back to pdfplumber if it is missing.
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+# Extracted text lines are cached here, keyed on the PDF contents, so repeat
+# runs on an unchanged PDF skip the (slow) PDF parsing pass entirely. The
+# user's cache directory is shared by every checkout and keeps the source
+# tree clean.
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "mtst-data",
+)
+# Bump this whenever extract_lines_from_pdf changes what it returns.
+_CACHE_VERSION = "1"
+
+# Text fragments whose tops are this close (in points) belong to the same line.
+# This matches pdfplumber's default y_tolerance.
+_LINE_Y_TOLERANCE = 3
+
+# Text extraction backends. pdfium is the fast default; pdfplumber lays text
+# out character by character and remains available as a fallback.
+BACKENDS = ("pdfium", "pdfplumber")
+
+# Pages are only farmed out to worker processes when each worker gets at least
+# this many, otherwise process start-up costs more than it saves.
+_MIN_PAGES_PER_WORKER = 4
+
 # These are the standard names for the columns, based on the "Cut order" header.
-CUT_ORDER_LABELS_LEFT = ["B", "BB", "A", "AA", "AAA", "AAAA"]
-CUT_ORDER_LABELS_RIGHT = ["AAAA", "AAA", "AA", "A", "BB", "B"]
+CUT_ORDER_LABELS_LEFT = ("B", "BB", "A", "AA", "AAA", "AAAA")
+CUT_ORDER_LABELS_RIGHT = ("AAAA", "AAA", "AA", "A", "BB", "B")
+# A "Cut order" header row, with or without the "Event" column label
+_CUT_ORDER_HEADERS = frozenset((
+    CUT_ORDER_LABELS_LEFT + ("Event",) + CUT_ORDER_LABELS_RIGHT,
+    CUT_ORDER_LABELS_LEFT + CUT_ORDER_LABELS_RIGHT,
+))
+
+# Event name parts, as frozensets for O(1) membership tests
+_STROKES = frozenset(("FR", "BK", "BR", "FL", "IM", "FR-R", "MED-R"))
+_COURSES = frozenset(("SCY", "SCM", "LCM"))
+_RELAY_STROKES = frozenset(("FR-R", "MED-R"))
+
+# Patterns are compiled once at import time; the row classifiers run on every
+# extracted line, so compiling (or even looking up the re cache) per call adds up.
+_TIME_RE = re.compile(r"^(?:\d{1,2}:)?\d{2}\.\d{2}$")
+# Captures (minutes, seconds) so validated cells don't need parsing again
+_TIME_STAR_RE = re.compile(r"^(?:(\d{1,2}):)?(\d{2}\.\d{2})(?:\s*\*)?$")
+_EVENT_RE = re.compile(r"^\d{2,4}\s+(FR|BK|BR|FL|IM|FR-R|MED-R)\s+(SCY|SCM|LCM)$")
+_TIMESTAMP_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}:\d{2} (AM|PM)")
+_PAGE_RE = re.compile(r"Page \d+ of \d+")
+_AGE_GENDER_PATTERN = r"(\d+ & over|\d+ & under|\d+-\d+|\d+)\s+(Girls|Boys)"
+# This pattern is flexible about the spacing around an optional "Event"
+_AGE_GENDER_RE = re.compile(rf"^{_AGE_GENDER_PATTERN}\s+(?:Event\s+)?{_AGE_GENDER_PATTERN}$")
 
 def parse_time_to_seconds(time_str):
     """
@@ -15,42 +74,220 @@ def parse_time_to_seconds(time_str):
     """
     if not time_str:
         return None
-    
-    time_str = time_str.replace('*', '').strip()
-    
-    if ':' in time_str:
-        parts = time_str.split(':')
-        if len(parts) == 2:
+
+    if '*' in time_str:
+        time_str = time_str.replace('*', '')
+
+    # float() ignores surrounding whitespace, so no strip() is needed
+    minutes, colon, seconds = time_str.partition(':')
+    try:
+        if not colon:
+            return float(time_str)
+        # A second colon ends up in `seconds` and makes float() fail
+        return float(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+def _lines_cache_path(pdf_path, cache_dir, backend):
+    """
+    Returns the cache file path for a PDF, keyed on its contents and on the
+    extraction backend and its version. Returns None if the PDF cannot be read.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{_CACHE_VERSION}:{_extractor_id(backend)}:".encode())
+    try:
+        with open(pdf_path, 'rb') as f:
+            digest.update(f.read())
+    except OSError:
+        return None
+    return os.path.join(cache_dir, f"{digest.hexdigest()}.json")
+
+def _read_cached_lines(cache_path):
+    """Loads cached text lines. Returns None on a missing or unreadable cache file."""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_cached_lines(cache_path, lines):
+    """Writes text lines to the cache, replacing the file atomically."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(lines, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write text line cache %s: %s", cache_path, e)
+
+def _extractor_id(backend):
+    """Names a text extraction backend, including its version."""
+    if backend == "pdfium":
+        return f"pypdfium2-{importlib.metadata.version('pypdfium2')}"
+    return f"pdfplumber-{pdfplumber.__version__}"
+
+def _pdfium_page_lines(page):
+    """
+    Rebuilds the text lines of a pypdfium2 page. The page's text fragments are
+    clustered into lines by their top coordinate, then each line is ordered
+    left to right, the same way pdfplumber groups characters into lines.
+    """
+    textpage = page.get_textpage()
+    try:
+        fragments = []
+        for i in range(textpage.count_rects()):
+            left, bottom, right, top = textpage.get_rect(i)
+            text = textpage.get_text_bounded(left, bottom, right, top).strip()
+            if text:
+                fragments.append((-top, left, text))
+    finally:
+        textpage.close()
+
+    # Sort top to bottom (PDF y coordinates grow upwards)
+    fragments.sort()
+    lines = []
+    line_top = None
+    for neg_top, left, text in fragments:
+        if line_top is None or neg_top - line_top > _LINE_Y_TOLERANCE:
+            lines.append([])
+            line_top = neg_top
+        lines[-1].append((left, text))
+    return [" ".join(text for _, text in sorted(line)) for line in lines]
+
+def _iter_lines_pdfium(pdf_path, page_numbers=None):
+    """
+    Yields the text lines of a PDF using pypdfium2.
+    page_numbers optionally restricts extraction to the given 0-based pages.
+    """
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        for i in (page_numbers if page_numbers is not None else range(len(pdf))):
+            logger.info("Processing page %d...", i + 1)
+            page = pdf[i]
             try:
-                minutes = float(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-            except ValueError:
-                return None
-    else:
+                yield from _pdfium_page_lines(page)
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+def _iter_lines_pdfplumber(pdf_path, page_numbers=None):
+    """
+    Yields the text lines of a PDF using pdfplumber.
+    page_numbers optionally restricts extraction to the given 0-based pages.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        for i in (page_numbers if page_numbers is not None else range(len(pdf.pages))):
+            logger.info("Processing page %d...", i + 1)
+            page = pdf.pages[i]
+            # Using extract_text_lines with layout=True is key.
+            # It preserves horizontal spacing, which helps differentiate columns.
+            page_lines = page.extract_text_lines(layout=True, strip=True)
+            # The pdf keeps every page it has handed out, along with the
+            # parsed layout objects cached on it; drop those before moving
+            # on so only one page is held in memory at a time.
+            page.close()
+            for line in page_lines:
+                yield line['text']
+
+def _resolve_backend(backend):
+    """
+    Checks a backend name from BACKENDS. None picks the fastest available one:
+    pdfium if pypdfium2 is installed, otherwise pdfplumber.
+    """
+    if backend is None:
+        return "pdfium" if pypdfium2 is not None else "pdfplumber"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    if backend == "pdfium" and pypdfium2 is None:
+        raise ValueError("The pdfium backend requires the pypdfium2 package")
+    return backend
+
+def _iter_lines(pdf_path, backend, page_numbers=None):
+    """Yields the text lines of a PDF using the given backend."""
+    if backend == "pdfium":
+        return _iter_lines_pdfium(pdf_path, page_numbers)
+    return _iter_lines_pdfplumber(pdf_path, page_numbers)
+
+def _count_pages(pdf_path, backend):
+    """Returns the number of pages in a PDF."""
+    if backend == "pdfium":
+        pdf = pypdfium2.PdfDocument(pdf_path)
         try:
-            return float(time_str)
-        except ValueError:
-            return None
+            return len(pdf)
+        finally:
+            pdf.close()
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def _extract_page_range(args):
+    """
+    Worker process entry point: returns the text lines of pages [start, stop).
+    PDF documents can't be pickled, so each worker reopens the file by path.
+    """
+    pdf_path, backend, start, stop = args
+    return list(_iter_lines(pdf_path, backend, range(start, stop)))
 
-def extract_lines_from_pdf(pdf_path):
+def _iter_lines_parallel(pdf_path, workers, backend):
+    """
+    Yields the text lines of a PDF, extracting contiguous page ranges in up to
+    `workers` processes. Pages are independent, so only the output order needs
+    preserving, which executor.map does.
+    """
+    n_pages = _count_pages(pdf_path, backend)
+    workers = min(workers, n_pages // _MIN_PAGES_PER_WORKER)
+    if workers <= 1:
+        yield from _iter_lines(pdf_path, backend)
+        return
+
+    pages_per_worker = -(-n_pages // workers)
+    page_ranges = [(pdf_path, backend, start, min(start + pages_per_worker, n_pages))
+                   for start in range(0, n_pages, pages_per_worker)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for lines in executor.map(_extract_page_range, page_ranges):
+            yield from lines
+
+def iter_lines_from_pdf(pdf_path, workers=1, backend=None):
     """
-    Extracts text lines from each page of a PDF, preserving layout.
+    Yields the text lines of a PDF in reading order, one page at a time, so
+    callers can start parsing before the whole document has been extracted.
+    With workers > 1, pages are extracted in parallel worker processes.
+    backend is one of BACKENDS, or None for the fastest available one.
+    """
+    backend = _resolve_backend(backend)
+    if workers > 1:
+        yield from _iter_lines_parallel(pdf_path, workers, backend)
+    else:
+        yield from _iter_lines(pdf_path, backend)
+
+def extract_lines_from_pdf(pdf_path, cache_dir=None, workers=1, backend=None):
+    """
+    Extracts text lines from each page of a PDF, in reading order.
     Returns a single flat list of all text lines.
+    If cache_dir is given, the lines are read from / written to a cache there.
+    With workers > 1, pages are extracted in parallel worker processes.
+    backend is one of BACKENDS, or None for the fastest available one.
     """
-    logging.info(f"Extracting text lines from: {pdf_path}")
+    logger.info("Extracting text lines from: %s", pdf_path)
+    backend = _resolve_backend(backend)
+    cache_path = _lines_cache_path(pdf_path, cache_dir, backend) if cache_dir else None
+    if cache_path:
+        cached_lines = _read_cached_lines(cache_path)
+        if cached_lines is not None:
+            logger.info("Loaded %d cached text lines from: %s", len(cached_lines), cache_path)
+            return cached_lines
+
     all_lines = []
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                logging.info(f"Processing page {i+1}...")
-                # Using extract_text_lines with layout=True is key.
-                # It preserves horizontal spacing, which helps differentiate columns.
-                page_lines = page.extract_text_lines(layout=True, strip=True)
-                for line in page_lines:
-                    all_lines.append(line['text'])
+        all_lines.extend(iter_lines_from_pdf(pdf_path, workers, backend))
     except Exception as e:
-        logging.error(f"An error occurred during extraction: {e}")
+        logger.error("An error occurred during extraction: %s", e)
+        # Never cache a partial extraction.
+        return all_lines
+
+    if cache_path:
+        _write_cached_lines(cache_path, all_lines)
     return all_lines
 
 def clean_row(items):
@@ -62,38 +299,46 @@ def clean_row(items):
         return []
 
     new_items = []
+    n = len(items)
     i = 0
-    time_pattern = re.compile(r"^(?:\d{1,2}:)?\d{2}\.\d{2}$")
 
-    while i < len(items):
+    while i < n:
+        item = items[i]
+        # Only the first two merge patterns start on a bare number; test it once.
+        is_number = item.isdigit()
+
         # Merge pattern: Event name split across three cells (e.g., "50", "FR", "SCY")
-        if (i + 2 < len(items) and
-                items[i].isdigit() and
-                items[i+1] in ("FR", "BK", "BR", "FL", "IM", "FR-R", "MED-R") and
-                items[i+2] in ("SCY", "SCM", "LCM")):
-            new_items.append(f"{items[i]} {items[i+1]} {items[i+2]}")
+        if (is_number and
+                i + 2 < n and
+                items[i+1] in _STROKES and
+                items[i+2] in _COURSES):
+            new_items.append(f"{item} {items[i+1]} {items[i+2]}")
             i += 3
             continue
 
-        # Merge pattern: Time split across two cells (e.g., "2", ":17.99")
-        if i + 1 < len(items) and items[i].isdigit() and items[i+1].startswith(':'):
-            merged_time = items[i] + items[i+1]
-            i += 2
-            # Check if the next item is an asterisk
-            if i < len(items) and items[i] == '*':
-                merged_time += " *"
-                i += 1
-            new_items.append(merged_time)
-            continue
+        if i + 1 < n:
+            next_item = items[i+1]
+
+            # Merge pattern: Time split across two cells (e.g., "2", ":17.99")
+            if is_number and next_item[:1] == ':':
+                merged_time = item + next_item
+                i += 2
+                # Check if the next item is an asterisk
+                if i < n and items[i] == '*':
+                    merged_time += " *"
+                    i += 1
+                new_items.append(merged_time)
+                continue
+
+            # Merge pattern: Time followed by a "*". The cheap comparison
+            # goes first so the regex only runs in front of an asterisk.
+            if next_item == '*' and _TIME_RE.match(item):
+                new_items.append(f"{item} *")
+                i += 2
+                continue
 
-        # Merge pattern: Time followed by a "*"
-        if i + 1 < len(items) and time_pattern.match(items[i]) and items[i+1] == '*':
-            new_items.append(f"{items[i]} *")
-            i += 2
-            continue
-        
         # If no pattern matches, just append the current item.
-        new_items.append(items[i])
+        new_items.append(item)
         i += 1
     return new_items
 
@@ -103,30 +348,27 @@ def is_whitespace_row(line_text):
 
 def is_general_title_row(line_text):
     """Checks for the main title string in a raw row."""
-    row_str = line_text
     return "motivational" in line_text.lower()
 
 def is_timestamp_row(line_text):
     """Checks for a timestamp string in a raw row."""
-    row_str = line_text
-    timestamp_pattern = r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}:\d{2} (AM|PM)"
-    return re.search(timestamp_pattern, row_str) is not None
+    # Cheap substring gate: almost no line contains a date, so skip the regex
+    return "/" in line_text and _TIMESTAMP_RE.search(line_text) is not None
 
 def is_page_number_row(line_text):
     """Checks for a page number string in a raw row."""
-    row_str = line_text
-    page_pattern = r"Page \d+ of \d+"
-    return re.search(page_pattern, row_str) is not None
+    return "Page " in line_text and _PAGE_RE.search(line_text) is not None
 
 def is_cut_order_header_row(cleaned_row):
     """
     Checks if a cleaned row is a "Cut order" header.
     It can be a 13-element list with "Event" or a 12-element list without it.
     """
-    expected_with_event = ["B", "BB", "A", "AA", "AAA", "AAAA", "Event", "AAAA", "AAA", "AA", "A", "BB", "B"]
-    expected_without_event = ["B", "BB", "A", "AA", "AAA", "AAAA", "AAAA", "AAA", "AA", "A", "BB", "B"]
-    
-    return cleaned_row == expected_with_event or cleaned_row == expected_without_event
+    # Nearly every row reaching this check is a data row starting with a
+    # time, so reject on the first cell before building a tuple.
+    if not cleaned_row or cleaned_row[0] != "B":
+        return False
+    return tuple(cleaned_row) in _CUT_ORDER_HEADERS
 
 
 def parse_age_gender_header(line_text):
@@ -135,11 +377,12 @@ def parse_age_gender_header(line_text):
     If it is, returns (left_context, right_context). Otherwise, (None, None).
     Example format: "10 Girls      Event      10 Boys"
     """
-    # This pattern is more flexible about the spacing around "Event"
-    age_gender_pattern = r"(\d+ & over|\d+ & under|\d+-\d+|\d+)\s+(Girls|Boys)"
-    full_pattern = re.compile(rf"^{age_gender_pattern}\s+(?:Event\s+)?{age_gender_pattern}$")
-    
-    match = full_pattern.match(line_text.strip())
+    # Only a handful of lines per document are headers, and every header
+    # names a gender, so skip the regex for everything else.
+    if "Girls" not in line_text and "Boys" not in line_text:
+        return None, None
+
+    match = _AGE_GENDER_RE.match(line_text.strip())
     if match:
         # Reconstruct the full context strings
         left_context = f"{match.group(1)} {match.group(2)}"
@@ -158,74 +401,90 @@ def is_data_row(row):
 
     # Check event format
     event = row[6]
-    event_pattern = re.compile(r'^\d{2,4}\s+(FR|BK|BR|FL|IM|FR-R|MED-R)\s+(SCY|SCM|LCM)$')
-    if not event_pattern.match(event):
+    if not _EVENT_RE.match(event):
         return False, f"Invalid event format: {event}"
 
-    standards_left = row[:6]
-    standards_right = row[7:]
-    time_columns = standards_left + standards_right
-
-    # Check time format
-    time_pattern = re.compile(r'^(?:\d{1,2}:)?\d{2}\.\d{2}(?:\s*\*)?$')
-    for item in time_columns:
-        if item and not time_pattern.match(item):
+    # Check time format, converting each cell to seconds from the same match
+    # and checking the order as we go (ignoring empty cells): the left 6
+    # standards must descend and the right 6 must ascend. Every cell is
+    # format-checked before any order problem is reported.
+    left_in_order = right_in_order = True
+    previous_left = previous_right = None
+    # Walk the row itself rather than slicing out the two standards sides;
+    # column 6 is the event.
+    for index, item in enumerate(row):
+        if not item or index == 6:
+            continue
+        match = _TIME_STAR_RE.match(item)
+        if not match:
             return False, f"Invalid time format in standards column: {item}"
-
-    # Convert to seconds for order comparison
-    parsed_left = [parse_time_to_seconds(t) for t in standards_left]
-    parsed_right = [parse_time_to_seconds(t) for t in standards_right]
-
-    # Check descending order for left 6 standards (ignoring None values)
-    comparable_left = [t for t in parsed_left if t is not None]
-    for i in range(len(comparable_left) - 1):
-        if comparable_left[i] < comparable_left[i+1]:
-            return False, "Left standards not in descending order"
-
-    # Check ascending order for right 6 standards (ignoring None values)
-    comparable_right = [t for t in parsed_right if t is not None]
-    for i in range(len(comparable_right) - 1):
-        if comparable_right[i] > comparable_right[i+1]:
-            return False, "Right standards not in ascending order"
+        minutes, seconds = match.groups()
+        seconds = int(minutes) * 60 + float(seconds) if minutes else float(seconds)
+        if index < 6:
+            if previous_left is not None and seconds > previous_left:
+                left_in_order = False
+            previous_left = seconds
+        else:
+            if previous_right is not None and seconds < previous_right:
+                right_in_order = False
+            previous_right = seconds
+
+    if not left_in_order:
+        return False, "Left standards not in descending order"
+    if not right_in_order:
+        return False, "Right standards not in ascending order"
             
     return True, None
 
 def parse_and_structure_data(text_lines):
     """
-    Takes a list of raw text lines, classifies each line, and builds a
-    structured list of data records.
+    Takes an iterable of raw text lines, classifies each line, and builds a
+    structured list of data records. The lines are consumed in a single
+    pass, so a generator can be passed straight from the PDF extractor.
     """
-    logging.info("\n--- Parsing and Structuring Data ---")
+    logger.info("\n--- Parsing and Structuring Data ---")
     structured_data = []
     flagged_rows = []
     
     # State variables to hold the current context
     left_context, right_context = None, None
-
-    i = 0
-    while i < len(text_lines):
-        line_text = text_lines[i]
+    left_age = left_gender = right_age = right_gender = None
+    # Every event repeats across age groups; share one string per event name
+    # between all the records that reference it.
+    events = {}
+
+    lines = iter(text_lines)
+    # A line read ahead by the split relay check that still needs processing
+    pending_line = None
+    line_num = 0
+    while True:
+        if pending_line is not None:
+            line_text, pending_line = pending_line, None
+        else:
+            line_text = next(lines, None)
+            if line_text is None:
+                break
+        line_num += 1
 
         # 1. Check for junk rows on the raw line string.
         if is_whitespace_row(line_text):
-            i += 1
             continue
         if is_general_title_row(line_text):
-            i += 1
             continue
         if is_timestamp_row(line_text):
-            i += 1
             continue
         if is_page_number_row(line_text):
-            i += 1
             continue
 
         # 2. Check for age/gender header on the raw line string.
         new_left, new_right = parse_age_gender_header(line_text)
         if new_left:
             left_context, right_context = new_left, new_right
-            logging.info(f"Context updated: {left_context} | {right_context}")
-            i += 1
+            # Split contexts into age and gender once per header, so every
+            # data row under it shares the same strings.
+            left_age, left_gender = left_context.rsplit(' ', 1)
+            right_age, right_gender = right_context.rsplit(' ', 1)
+            logger.info("Context updated: %s | %s", left_context, right_context)
             continue
 
         # 3. If not a junk/context row, split into items and clean them.
@@ -233,7 +492,6 @@ def parse_and_structure_data(text_lines):
         cleaned = clean_row(items)
 
         if not cleaned:
-            i += 1
             continue
 
         # --- START: New logic to handle split relay rows ---
@@ -242,14 +500,17 @@ def parse_and_structure_data(text_lines):
         is_split_relay_part1 = (
             len(cleaned) == 14 and
             cleaned[6].isdigit() and
-            cleaned[7] in ("FR-R", "MED-R")
+            cleaned[7] in _RELAY_STROKES
         )
 
-        if is_split_relay_part1 and i + 1 < len(text_lines):
-            next_line_text = text_lines[i+1]
-            cleaned_next_row = clean_row(next_line_text.split())
-            if len(cleaned_next_row) == 1 and cleaned_next_row[0] in ("SCY", "SCM", "LCM"):
-                course = cleaned_next_row[0]
+        if is_split_relay_part1:
+            next_line_text = next(lines, None)
+            # A lone course token is never merged by clean_row, so the raw
+            # split is enough here; the line is only cleaned once, when it
+            # is processed in its own right.
+            next_items = next_line_text.split() if next_line_text is not None else []
+            if len(next_items) == 1 and next_items[0] in _COURSES:
+                course = next_items[0]
                 event_str = f"{cleaned[6]} {cleaned[7]} {course}"
                 
                 # Reconstruct the row with the merged event
@@ -257,12 +518,14 @@ def parse_and_structure_data(text_lines):
                 # The result will be a 13-element row, matching is_data_row's expectation.
                 merged_row = cleaned[:6] + [event_str] + cleaned[8:]
                 cleaned = merged_row
-                i += 1 # Increment to skip the course line we just consumed
+                line_num += 1 # The course line has been consumed
+            elif next_line_text is not None:
+                # Not a course line; process it on the next iteration.
+                pending_line = next_line_text
         # --- END: New logic ---
 
         # 4. Check for the "Cut order" header on the cleaned row.
         if is_cut_order_header_row(cleaned):
-            i += 1
             continue
 
         # 5. Process as a potential data row.
@@ -270,17 +533,18 @@ def parse_and_structure_data(text_lines):
         if is_valid_data:
             if not left_context or not right_context:
                 reason = "Data row found without age/gender context"
-                flagged_rows.append((cleaned, reason, i + 1))
-                i += 1
+                flagged_rows.append((cleaned, reason, line_num))
                 continue
             
-            event = cleaned[6]
-            
-            # Split contexts into age and gender
-            left_age, left_gender = left_context.rsplit(' ', 1)
-            right_age, right_gender = right_context.rsplit(' ', 1)
-
-            left_standards = {label: time for label, time in zip(CUT_ORDER_LABELS_LEFT, cleaned[:6]) if time}
+            event = events.setdefault(cleaned[6], cleaned[6])
+
+            # Index straight into the row: no slices, zip iterators or
+            # comprehension frames per data row. Column 6 is the event.
+            left_standards = {}
+            for k in range(6):
+                time = cleaned[k]
+                if time:
+                    left_standards[CUT_ORDER_LABELS_LEFT[k]] = time
             if left_standards:
                 structured_data.append({
                     "age": left_age,
@@ -289,7 +553,11 @@ def parse_and_structure_data(text_lines):
                     "standards": left_standards
                 })
 
-            right_standards = {label: time for label, time in zip(CUT_ORDER_LABELS_RIGHT, cleaned[7:]) if time}
+            right_standards = {}
+            for k in range(6):
+                time = cleaned[7 + k]
+                if time:
+                    right_standards[CUT_ORDER_LABELS_RIGHT[k]] = time
             if right_standards:
                 structured_data.append({
                     "age": right_age,
@@ -299,33 +567,41 @@ def parse_and_structure_data(text_lines):
                 })
         else:
             # It's not a header, not data, not junk we know about. Flag it.
-            flagged_rows.append((cleaned, reason, i + 1))
-        
-        i += 1 # Main loop increment
+            flagged_rows.append((cleaned, reason, line_num))
 
     if flagged_rows:
-        logging.warning("\n--- Flagged Rows for Review ---")
+        logger.warning("\n--- Flagged Rows for Review ---")
         for row, reason, line_num in flagged_rows:
-            logging.warning(f"Line {line_num}: {row} - Reason: {reason}")
+            logger.warning("Line %d: %s - Reason: %s", line_num, row, reason)
 
     return structured_data
 
-def main():
+def main(argv=None):
     """
     Main function to parse command-line arguments and run the extraction process.
+    argv defaults to sys.argv[1:]; pass a list to run the CLI in-process.
     """
     parser = argparse.ArgumentParser(description="Extract motivational standards from a USA Swimming PDF.")
     parser.add_argument("input_pdf", help="Path to the input PDF file.")
     parser.add_argument("output_json", help="Path for the output JSON file.")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output for debugging.")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="Always re-extract the PDF instead of using cached text lines.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to extract PDF pages (default: number of CPUs).")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="PDF text extraction backend (default: pdfium if pypdfium2 is installed, else pdfplumber).")
+    args = parser.parse_args(argv)
+    if args.backend == "pdfium" and pypdfium2 is None:
+        parser.error("--backend pdfium requires the pypdfium2 package")
 
     # Configure logging
     log_level = logging.INFO if args.verbose else logging.WARNING
     # Use a basic format that doesn't include the log level name for cleaner output
     logging.basicConfig(level=log_level, format='%(message)s')
 
-    text_lines = extract_lines_from_pdf(pdf_path=args.input_pdf)
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+    text_lines = extract_lines_from_pdf(pdf_path=args.input_pdf, cache_dir=cache_dir, workers=args.jobs,
+                                        backend=args.backend)
     
     if text_lines:
         structured_data = parse_and_structure_data(text_lines)
@@ -1,5 +1,7 @@
 import subprocess
+import sys
 import json
+from functools import lru_cache
 import pytest
 from extract import (
     parse_time_to_seconds,
@@ -12,20 +14,39 @@ from extract import (
     parse_age_gender_header,
     is_data_row,
     parse_and_structure_data,
+    extract_lines_from_pdf,
+    _iter_lines_pdfium,
+    _iter_lines_pdfplumber,
+    main,
 )
 
 # --- Constants for Data Integrity Checks ---
 CUT_ORDER = ["B", "BB", "A", "AA", "AAA", "AAAA"]
 
+EXPECTED_GENDERS = frozenset({"Girls", "Boys"})
+
 EXPECTED_AGES = {
-    "2028-motivational-standards-single-age": {
+    "2028-motivational-standards-single-age": frozenset({
         "10", "11", "12", "13", "14", "15", "16", "17", "18"
-    },
-    "2028-motivational-standards-age-group": {
+    }),
+    "2028-motivational-standards-age-group": frozenset({
         "10 & under", "11-12", "13-14", "15-16", "17-18"
-    },
+    }),
 }
 
+@lru_cache(maxsize=None)
+def load_golden_json(name):
+    """
+    Loads a golden JSON file from test/data, parsing each file only once per
+    session. Callers must not modify the returned data.
+    """
+    with open(f"test/data/{name}.json", 'r') as f:
+        return json.load(f)
+
+# The integrity checks parse the same time strings over and over across ages
+# and cuts, so they share one memoized wrapper.
+_parse_time = lru_cache(maxsize=None)(parse_time_to_seconds)
+
 # --- Test Utility Functions ---
 
 @pytest.mark.parametrize("time_str, expected", [
@@ -38,6 +59,7 @@ EXPECTED_AGES = {
     (None, None),
     ("invalid", None),
     ("1:2:3", None),
+    ("1.5:30", 120.0),
 ])
 def test_parse_time_to_seconds(time_str, expected):
     assert parse_time_to_seconds(time_str) == expected
@@ -116,6 +138,9 @@ def test_parse_age_gender_header(line, expected):
     (["3:09.09", "2:55.89", "2:42.59", "2:35.99", "2:40.00", "2:22.79", "200 FR SCY", "2:16.19", "2:22.59", "2:35.39", "2:48.19", "3:00.99", "3:13.79"], False, "Left standards not in descending order"),
     # Right standards not ascending
     (["3:09.09", "2:55.89", "2:42.59", "2:35.99", "2:29.39", "2:22.79", "200 FR SCY", "2:16.19", "2:22.59", "2:20.00", "2:48.19", "3:00.99", "3:13.79"], False, "Right standards not in ascending order"),
+], ids=[
+    "valid", "valid-empty-standards", "column-count", "event-format",
+    "time-format", "left-order", "right-order",
 ])
 def test_is_data_row(row, expected_valid, expected_reason):
     is_valid, reason = is_data_row(row)
@@ -205,82 +230,170 @@ def test_parse_and_structure_data_age_group():
     assert structured_data == expected_data
 
 
-@pytest.mark.parametrize("pdf_name", [
+def test_parse_and_structure_data_streaming():
+    """
+    Lines may be passed as a one-shot generator. A relay row whose course
+    line is missing must not swallow the line that follows it.
+    """
+    sample_lines = [
+        "11-12 Girls      Event      11-12 Boys",
+        # Split relay row without its course line: flagged, not merged
+        "2:41.19 * 2:29.69 * 2:18.19 * 2:12.39 * 2:06.69 * 2:00.89 * 200 MED-R 1:55.59 * 2:01.09 * 2:06.59 * 2:12.09 * 2:23.09 * 2:34.09 *",
+        "35.59 33.29 30.99 29.89 28.79 27.59 50 FR SCY 27.59 28.79 29.99 31.19 33.59 35.99",
+    ]
+
+    structured_data = parse_and_structure_data(line for line in sample_lines)
+    assert [(record["gender"], record["event"]) for record in structured_data] == [
+        ("Girls", "50 FR SCY"),
+        ("Boys", "50 FR SCY"),
+    ]
+
+@pytest.fixture(scope="session", params=[
     "2028-motivational-standards-single-age",
     "2028-motivational-standards-age-group",
 ])
-def test_end_to_end_extraction(pdf_name, tmp_path):
+def extracted_json(request, tmp_path_factory):
+    """
+    Runs the full PDF to JSON extraction once per golden PDF and returns the
+    PDF name with the generated data, shared by every test in the session.
+    """
+    pdf_name = request.param
+    output_json_path = tmp_path_factory.mktemp("extracted") / f"{pdf_name}.json"
+
+    # Run the extraction in-process, exactly as the command line would. One
+    # job: no process pool forked from pytest (or from each xdist worker);
+    # test_extract_lines_from_pdf_parallel covers the parallel path.
+    main(["--no-cache", "-j", "1", f"data/{pdf_name}.pdf", str(output_json_path)])
+    assert output_json_path.exists(), "Output JSON file was not created."
+
+    with open(output_json_path, 'r') as f:
+        return pdf_name, json.load(f)
+
+@pytest.mark.slow
+def test_end_to_end_extraction(extracted_json):
     """
     Tests the full extraction process from PDF to JSON and compares the
     output to a known-good "golden" file.
     """
-    input_pdf = f"data/{pdf_name}.pdf"
-    golden_json_path = f"test/data/{pdf_name}.json"
+    pdf_name, generated_data = extracted_json
+
+    # Load the contents of the "golden" JSON file
+    golden_data = load_golden_json(pdf_name)
+
+    # Compare the data
+    assert generated_data == golden_data, "Generated JSON does not match the golden file."
+
+@pytest.mark.slow
+def test_command_line(tmp_path):
+    """Smoke test: extract.py runs as a script and writes the JSON output."""
+    pdf_name = "2028-motivational-standards-age-group"
     output_json_path = tmp_path / f"{pdf_name}.json"
 
-    # Run the extraction script as a subprocess
     result = subprocess.run(
-        ["python", "extract.py", input_pdf, str(output_json_path)],
+        # The interpreter running the tests, not whichever "python" is on PATH
+        [sys.executable, "extract.py", "--no-cache", f"data/{pdf_name}.pdf", str(output_json_path)],
         capture_output=True,
         text=True
     )
 
-    # Ensure the script ran successfully
-    assert result.returncode == 0, f"Script failed for {pdf_name}: {result.stderr}"
-    assert output_json_path.exists(), "Output JSON file was not created."
-
-    # Load the contents of the newly generated JSON file
+    assert result.returncode == 0, f"Script failed: {result.stderr}"
     with open(output_json_path, 'r') as f:
-        generated_data = json.load(f)
-
-    # Load the contents of the "golden" JSON file
-    with open(golden_json_path, 'r') as f:
-        golden_data = json.load(f)
+        assert json.load(f) == load_golden_json(pdf_name)
 
-    # Compare the data
-    assert generated_data == golden_data, "Generated JSON does not match the golden file."
-
-@pytest.mark.parametrize("json_file_name", [
+@pytest.mark.slow
+def test_extract_lines_from_pdf_cache(tmp_path, monkeypatch):
+    """
+    A second extraction of the same PDF must be served from the cache
+    without touching pdfplumber.
+    """
+    input_pdf = "data/2028-motivational-standards-age-group.pdf"
+    cache_dir = tmp_path / "cache"
+
+    lines = extract_lines_from_pdf(input_pdf, cache_dir=str(cache_dir))
+    assert lines
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def fail_extract(*args, **kwargs):
+        raise AssertionError("PDF extracted again despite a cache hit")
+
+    monkeypatch.setattr("extract._iter_lines_pdfium", fail_extract)
+    monkeypatch.setattr("extract._iter_lines_pdfplumber", fail_extract)
+    assert extract_lines_from_pdf(input_pdf, cache_dir=str(cache_dir)) == lines
+
+@pytest.mark.slow
+def test_extract_lines_from_pdf_parallel():
+    """Extracting pages in worker processes must not change the line order."""
+    input_pdf = "data/2028-motivational-standards-single-age.pdf"
+    assert extract_lines_from_pdf(input_pdf, workers=3) == extract_lines_from_pdf(input_pdf)
+
+@pytest.mark.parametrize("backend", ["pdfium", "pdfplumber"])
+def test_extract_lines_from_pdf_backend(backend, monkeypatch):
+    """The requested backend, and only that one, extracts the PDF."""
+    calls = []
+
+    def fake_backend(name):
+        def iter_lines(pdf_path, page_numbers=None):
+            calls.append(name)
+            return iter([f"{name} line"])
+        return iter_lines
+
+    monkeypatch.setattr("extract._iter_lines_pdfium", fake_backend("pdfium"))
+    monkeypatch.setattr("extract._iter_lines_pdfplumber", fake_backend("pdfplumber"))
+    input_pdf = "data/2028-motivational-standards-age-group.pdf"
+    assert extract_lines_from_pdf(input_pdf, backend=backend) == [f"{backend} line"]
+    assert calls == [backend]
+
+def test_extract_lines_from_pdf_unknown_backend():
+    with pytest.raises(ValueError):
+        extract_lines_from_pdf("data/2028-motivational-standards-age-group.pdf", backend="pymupdf")
+
+@pytest.mark.slow
+@pytest.mark.parametrize("pdf_name", [
     "2028-motivational-standards-single-age",
     "2028-motivational-standards-age-group",
 ])
-def test_data_integrity(json_file_name):
+def test_pdfium_lines_match_pdfplumber(pdf_name):
+    """
+    The pypdfium2 and pdfplumber backends may space cells differently, but
+    must produce the same cells on the same lines.
     """
-    Loads the golden JSON files and performs data integrity checks:
+    input_pdf = f"data/{pdf_name}.pdf"
+    pdfium_rows = [line.split() for line in _iter_lines_pdfium(input_pdf)]
+    pdfplumber_rows = [line.split() for line in _iter_lines_pdfplumber(input_pdf)]
+    assert [row for row in pdfium_rows if row] == [row for row in pdfplumber_rows if row]
+
+@pytest.mark.slow
+def test_data_integrity(extracted_json):
+    """
+    Performs data integrity checks on the JSON extracted from each golden PDF:
     1. Times must be monotonically decreasing from B to AAAA.
     2. All expected genders (Girls, Boys) must be present.
     3. All expected age groups for that file type must be present.
     """
-    json_path = f"test/data/{json_file_name}.json"
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-
-    found_genders = set()
-    found_ages = set()
+    json_file_name, data = extracted_json
 
     for record in data:
-        found_genders.add(record["gender"])
-        found_ages.add(record["age"])
-
         # Check 1: Verify that times are monotonically decreasing
         standards = record["standards"]
-        times_in_seconds = [parse_time_to_seconds(standards.get(cut)) for cut in CUT_ORDER]
-        
+        times_in_seconds = [(cut, _parse_time(standards.get(cut))) for cut in CUT_ORDER]
+
         # Filter out None values for events that don't have all standards
-        valid_times = [t for t in times_in_seconds if t is not None]
+        valid_times = [(cut, t) for cut, t in times_in_seconds if t is not None]
 
-        for i in range(1, len(valid_times)):
-            # Each time must be less than or equal to the previous (slower) one
-            assert valid_times[i] <= valid_times[i-1], (
+        # Compare each time with the previous (slower) one in a single pass
+        for (slower_cut, slower), (faster_cut, faster) in zip(valid_times, valid_times[1:]):
+            assert faster <= slower, (
                 f"Time standards are not decreasing for {record['age']} {record['gender']} {record['event']}.\n"
-                f"  - Got {valid_times[i-1]} for {CUT_ORDER[i-1]}.\n"
-                f"  - Got {valid_times[i]} for {CUT_ORDER[i]}."
+                f"  - Got {slower} for {slower_cut}.\n"
+                f"  - Got {faster} for {faster_cut}."
             )
 
     # Check 2: Verify all genders are present
-    assert found_genders == {"Girls", "Boys"}, f"Missing or unexpected genders in {json_file_name}.json"
+    found_genders = {record["gender"] for record in data}
+    assert found_genders == EXPECTED_GENDERS, f"Missing or unexpected genders in {json_file_name}.json"
 
     # Check 3: Verify all age groups are present for the file type
     expected_age_set = EXPECTED_AGES[json_file_name]
+    found_ages = {record["age"] for record in data}
     assert found_ages == expected_age_set, f"Missing or unexpected age groups in {json_file_name}.json"
 